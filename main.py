@@ -1,20 +1,31 @@
 from random import randrange
 
+_AXIS_SOLVE = ((-1, 0), (1, 0), (0, -1), (0, 1))
+_ROOT = len(_AXIS_SOLVE) + 1
+_AXIS_GENERATE = ((-2, 0), (2, 0), (0, -2), (0, 2))
+_TO_DIGITS = bytes.maketrans(b"\x00\x01\x02", b"012")
+_FROM_DIGITS = bytes.maketrans(b"012", b"\x00\x01\x02")
+_PAINT = str.maketrans({0: '  ', 1: '\u2588\u2588', 2: '//'})
+
+
+def _paint(rows: list[bytearray]) -> str:
+    return '\n'.join(row.decode('latin-1').translate(_PAINT) for row in rows)
+
 
 class Maze:
     def __init__(self, tiles: list[list[int]] = None):
-        self.tiles = tiles
+        self.tiles = [bytearray(row) for row in tiles]
         self.size_x = len(self.tiles[0])
         self.size_y = len(self.tiles)
         self.entrances = None
-        self.solved = False
         self.path = None
-        self.path_support = set()
+        self._str_cache = None
 
     def __str__(self):
-        def paint(tile: int) -> str:
-            return ('  ', '\u2588\u2588', '//')[tile]
-        return '\n'.join([''.join(tuple(map(paint, row))) for row in self.tiles])
+        # Rendering is O(size_x * size_y), so it is done once and reset by every method that carves the grid
+        if self._str_cache is None:
+            self._str_cache = _paint(self.tiles)
+        return self._str_cache
 
     @classmethod
     def create_maze(cls, size_x: int, size_y: int):
@@ -23,7 +34,7 @@ class Maze:
         :param size_y: height of the maze grid
         :return: Maze instance of specified height and width, with randomly generated paths and exactly two entrances
         """
-        instance = cls([[1 for _ in range(size_x)] for _ in range(size_y)])
+        instance = cls([bytearray(b"\x01") * size_x for _ in range(size_y)])
         instance.generate()
         instance.create_entrances()
         return instance
@@ -35,15 +46,14 @@ class Maze:
         :param filename: filename that refers to txt file
         :return: Maze instance reflecting contents of the file
         """
-        with open(f"{filename}.txt", "r") as file:
-            instance = cls([list(map(int, [a for a in line.strip()])) for line in file])
+        with open(f"{filename}.txt", "rb") as file:
+            instance = cls([line.strip().translate(_FROM_DIGITS) for line in file.read().splitlines()])
         instance.find_entrances()
         return instance
 
     def save_to_file(self, filename: str):
-        with open(f"{filename}.txt", "w") as file:
-            for line in self.tiles:
-                file.write("".join(map(str, line)) + "\n")
+        with open(f"{filename}.txt", "wb") as file:
+            file.write(b"".join(line.translate(_TO_DIGITS) + b"\n" for line in self.tiles))
 
     def create_entrances(self):
         """
@@ -51,51 +61,46 @@ class Maze:
         Both entrances have random position that cannot be a corner. From this position a "tunnel" is then carved until
         it encounters any tile that is not a wall.
         """
-        self.entrances = ((randrange(1, self.size_y - 1, 2), 0), (randrange(1, self.size_y - 1, 2), self.size_x - 1))
-        for y, x in self.entrances:
-            self.tiles[y][x] = 0
-            if x == 0:
-                i = 1
-                while x < self.size_x - 1:
-                    if self.tiles[y][x + i] != 0:
-                        self.tiles[y][x + i] = 0
-                    else:
-                        break
-            elif x == self.size_x-1:
-                i = 1
-                while x > 0:
-                    if self.tiles[y][x - i] != 0:
-                        self.tiles[y][x - i] = 0
-                    else:
-                        break
+        # Odd rows between the corners, drawn as 2 * k + 1 to skip the range object built by a stepped randrange
+        rows = (self.size_y - 1) // 2
+        left_y, right_y = randrange(rows) * 2 + 1, randrange(rows) * 2 + 1
+        self.entrances = ((left_y, 0), (right_y, self.size_x - 1))
+        self._str_cache = None
+        row = self.tiles[left_y]
+        stop = row.find(0)
+        stop = len(row) if stop == -1 else stop
+        row[:stop] = bytes(stop)
+        row = self.tiles[right_y]
+        start = row.rfind(0) + 1
+        row[start:] = bytes(len(row) - start)
 
     def find_entrances(self):
         """
         Finds entrances in a maze and stores them in variable that can be later used by solve_maze
         """
-        entrances = []
-        for i, row in enumerate(self.tiles):
-            if row[0] == 0:
-                entrances.append((i, 0))
-        for i, row in enumerate(self.tiles):
-            if row[self.size_x - 1] == 0:
-                entrances.append((i, self.size_x - 1))
-        self.entrances = entrances
+        self.entrances = ([(i, 0) for i, row in enumerate(self.tiles) if row[0] == 0] +
+                          [(i, self.size_x - 1) for i, row in enumerate(self.tiles) if row[-1] == 0])
 
     def generate(self):
         """
         Carves random paths inside the Maze grid using Prim's algorithm for Minimum Spanning Tree.
         Between any two points of the created Maze there is exactly one path.
         """
-        rand_y, rand_x = (randrange(1, self.size_x - 1, 2), randrange(1, self.size_y - 1, 2))
-        nodes = set()
-        nodes.add((rand_y, rand_x, rand_y, rand_x))
+        tiles, max_y, max_x = self.tiles, self.size_y - 1, self.size_x - 1
+        self._str_cache = None
+        rand_y, rand_x = (randrange(1, max_y, 2), randrange(1, max_x, 2))
+        nodes = [(rand_y, rand_x, rand_y, rand_x)]
         while nodes:
+            # Swap a random frontier entry with the last one, so it can be popped in O(1)
+            i = randrange(len(nodes))
+            nodes[i], nodes[-1] = nodes[-1], nodes[i]
             y, x, y1, x1 = nodes.pop()
-            if self.tiles[y][x] == 1:
-                self.tiles[y][x] = 0
-                self.tiles[y1][x1] = 0
-                nodes.update(self.find_nodes((y, x)))
+            if tiles[y][x] == 1:
+                tiles[y][x] = 0
+                tiles[y1][x1] = 0
+                for i, j in _AXIS_GENERATE:
+                    if 0 < y + i < max_y and 0 < x + j < max_x and tiles[y + i][x + j] == 1:
+                        nodes.append((y + i, x + j, y + i // 2, x + j // 2))
 
     def find_nodes(self, node: tuple[int, ...], solve: bool = False) -> set[tuple[int, ...]]:
         """
@@ -104,52 +109,91 @@ class Maze:
         :param solve: when False, functions looks for surrounding wall tiles, otherwise it looks for surrounding
         path tiles.
         """
-        nodes = set()
+        y, x = node[0], node[1]
+        tiles, size_x, size_y = self.tiles, self.size_x, self.size_y
         if solve:
-            axis = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-            offset = 0
-        else:
-            axis = [(-2, 0), (2, 0), (0, -2), (0, 2)]
-            offset = 1
-        for i, j in axis:
-            if (0 < node[0] + i < self.size_y - 1 and
-                    0 < node[1] + j < self.size_x - offset and
-                    self.tiles[node[0] + i][node[1] + j] == offset):
-                if solve:
-                    nodes.add((node[0] + i, node[1] + j))
+            return {(y + i, x + j) for i, j in _AXIS_SOLVE
+                    if 0 < y + i < size_y - 1 and 0 < x + j < size_x and tiles[y + i][x + j] == 0}
+        return {(y + i, x + j, y + i // 2, x + j // 2) for i, j in _AXIS_GENERATE
+                if 0 < y + i < size_y - 1 and 0 < x + j < size_x - 1 and tiles[y + i][x + j] == 1}
+
+    def solve_maze(self, shortest: bool = True):
+        """
+        Solves maze with bidirectional breadth-first search, growing one search from each entrance a whole level at a
+        time until they meet. Expanding the smaller frontier first lets the searches cut each other off, so far fewer
+        tiles are visited than by a single search. Every visited tile stores the direction it was entered from and
+        which entrance reached it, so the shortest path is rebuilt once by walking back from the meeting point.
+        :param shortest: when False, depth-first search is used instead, which finds any path and keeps only
+        the current branch in memory
+        """
+        start, goal = self.entrances[0], self.entrances[1]
+        tiles, size_x, max_y = self.tiles, self.size_x, self.size_y - 1
+        if not shortest:
+            visited = [bytearray(size_x) for _ in range(max_y + 1)]
+            visited[start[0]][start[1]] = 1
+            # Stack holds one iterator over unexplored neighbours per node of the current path
+            path, stack = [start], [iter(self.find_nodes(start, solve=True))]
+            while stack and path[-1] != goal:
+                for y, x in stack[-1]:
+                    if not visited[y][x]:
+                        break
                 else:
-                    nodes.add((node[0] + i, node[1] + j, node[0] + i // 2, node[1] + j // 2))
-        return nodes
-
-    def solve_maze(self, node: tuple[int, ...] = None, path: list[tuple[int]] = None):
-        """
-        Solves maze by checking every possible path from the entrance until it finds another entrance.
-        All concurrent function instances are stopped when entrance is found.
-        :param node: node where function starts looking for possible path
-        :param path: current path of function instance, it avoids searching repetitions
-        :return:
-        """
-        self.path_support.add(node)
-        if node is None:
-            node = self.entrances[0]
-        if path is None:
-            path = []
-        if self.solved:
+                    stack.pop()
+                    path.pop()
+                    continue
+                visited[y][x] = 1
+                path.append((y, x))
+                stack.append(iter(self.find_nodes((y, x), solve=True)))
+            self.path = path
             return
-        if node == self.entrances[1]:
-            self.path = path + [node]
-            self.solved = True
-        for new_node in self.find_nodes(node, solve=True).difference(self.path_support):
-            self.solve_maze(new_node, path + [node])
-
-    def printable_solved_maze(self):
-        """
-        Invokes solve_maze if Maze has not been already solved. Adds solution path to Maze grid.
-        """
-        if not self.solved:
+        # 0 marks unvisited tiles, k marks tiles the start search entered by the step _AXIS_SOLVE[k - 1] and
+        # _ROOT + k the same for the exit search, while the entrances themselves are marked with _ROOT and 2 * _ROOT
+        came_from = [bytearray(size_x) for _ in range(max_y + 1)]
+        came_from[start[0]][start[1]] = _ROOT
+        came_from[goal[0]][goal[1]] = 2 * _ROOT
+        frontiers = [[start], [goal]]
+        meeting = None
+        while meeting is None and frontiers[0] and frontiers[1]:
+            side = len(frontiers[0]) > len(frontiers[1])
+            offset, frontier = side * _ROOT, []
+            for y, x in frontiers[side]:
+                for k, (i, j) in enumerate(_AXIS_SOLVE, 1):
+                    if 0 < y + i < max_y and 0 < x + j < size_x and tiles[y + i][x + j] == 0:
+                        mark = came_from[y + i][x + j]
+                        if not mark:
+                            came_from[y + i][x + j] = offset + k
+                            frontier.append((y + i, x + j))
+                        elif (mark > _ROOT) != side:
+                            meeting = ((y + i, x + j), (y, x)) if side else ((y, x), (y + i, x + j))
+                            break
+                if meeting is not None:
+                    break
+            frontiers[side] = frontier
+        path = []
+        if meeting is not None:
+            for offset, node in zip((0, _ROOT), meeting):
+                half = []
+                y, x = node
+                while came_from[y][x] != offset + _ROOT:
+                    half.append((y, x))
+                    i, j = _AXIS_SOLVE[came_from[y][x] - offset - 1]
+                    y, x = y - i, x - j
+                half.append((y, x))
+                path.extend(half if offset else reversed(half))
+        self.path = path
+
+    def printable_solved_maze(self) -> str:
+        """
+        Invokes solve_maze if Maze has not been already solved. Paints solution path over a copy of Maze grid, so
+        the Maze itself stays unchanged and can be saved or solved again.
+        :return: Maze grid with solution path, ready to be printed
+        """
+        if self.path is None:
             self.solve_maze()
+        rows = [row[:] for row in self.tiles]
         for y, x in self.path:
-            self.tiles[y][x] = 2
+            rows[y][x] = 2
+        return _paint(rows)
 
 
 class Menu:
@@ -191,8 +235,7 @@ class Menu:
             elif command == "4":
                 print(self.maze)
             elif command == "5":
-                self.maze.printable_solved_maze()
-                print(self.maze)
+                print(self.maze.printable_solved_maze())
 
 
 if __name__ == "__main__":